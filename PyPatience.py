@@ -20,7 +20,7 @@ APPLICATION_VERSION = "1.0.0.0"
 import math
 import random
 import os
-import copy
+import itertools
 
 from PyQt6.QtGui import *
 from PyQt6.QtWidgets import *
@@ -41,6 +41,7 @@ DECK_RED = 0
 DECK_BLUE = 1
 
 CARD_RATIO = 485 / 334
+STOCK_RING_RATIO = 0.75   # diameter of the ring on the stock relative to the card width
 
 ACE = 1
 KING = 13
@@ -49,6 +50,8 @@ KING = 13
 
 class Card:
 
+    __slots__ = ("suit", "value", "image", "face_up")
+
     def __init__(self, suit, value, pixmap):
         self.suit = suit
         self.value = value     # [1,13]
@@ -63,6 +66,9 @@ class Card:
 ################################################################################
 
 class Pile:
+
+    __slots__ = ("index", "tableau", "cards", "rect", "visibility",
+                 "card_rect", "pixmap_rect", "back_rect")
     
     def __init__(self, tableau, index=0):
         self.index = index
@@ -70,19 +76,21 @@ class Pile:
         self.cards = []
         self.rect = QRect()
         self.visibility = 0.12   # value [0,1] that determines how visible an underlying card is
+        # Scratch rects reused by draw_pile() and draw_card_back(), so that
+        # painting does not allocate new QRect objects for every card.
+        self.card_rect = QRect()
+        self.pixmap_rect = QRect()
+        self.back_rect = QRect()
 
     def draw_card_back(self, qpainter, qrect):
         qpainter.save()
-        pen = QPen()
-        qpainter.setPen(pen)
-        back_color = QColorConstants.Red
-        if self.tableau.deck == DECK_BLUE:
-            back_color = QColorConstants.Blue
-        qpainter.setBrush(QBrush(back_color, style=Qt.BrushStyle.DiagCrossPattern))
+        qpainter.setPen(self.tableau.no_pen)
+        qpainter.setBrush(self.tableau.back_brushes.get(self.tableau.deck,
+                                                        self.tableau.default_back_brush))
         border = round(qrect.width() * 0.07)
-        r = qrect.adjusted(border, border, -border, -border)
-        pen.setStyle(Qt.PenStyle.NoPen)
-        qpainter.setPen(pen)
+        r = self.back_rect
+        r.setRect(qrect.x() + border, qrect.y() + border,
+                  qrect.width() - 2 * border, qrect.height() - 2 * border)
         t = round(r.width() * 0.06)
         qpainter.drawRoundedRect(r, t, t)
         qpainter.restore()
@@ -91,9 +99,10 @@ class Pile:
         if len(self.cards) == 0:
             return
         qpainter.save()
-        qpainter.setBrush(QBrush(QColor(255,255,255)))
-        qpainter.setPen(QPen())
-        r = copy.copy(self.rect)
+        qpainter.setBrush(self.tableau.card_brush)
+        qpainter.setPen(self.tableau.card_pen)
+        r = self.card_rect
+        pixmap_rect = self.pixmap_rect
         i = 0
         if self.visibility == 0.0:
             # draw only last/top card
@@ -102,7 +111,7 @@ class Pile:
             self.get_card_rect(r, i)
             t =  round(r.width() * 0.06)
             qpainter.drawRoundedRect(r, t, t)   # filled rounded rect
-            pixmap_rect = scale_rect_around_center(r, 0.95)
+            scale_rect_around_center(r, 0.95, pixmap_rect)
             if self.cards[i].face_up:
                 qpainter.drawPixmap(pixmap_rect, self.cards[i].image)
             else:
@@ -128,7 +137,7 @@ class Pile:
             i += 1
             
     def get_card_at(self, x, y):
-        r = QRect()
+        r = self.tableau.hit_rect
         i = len(self.cards) - 1
         while i >= 0:
             self.get_card_rect(r, i)
@@ -137,13 +146,14 @@ class Pile:
             i -= 1
         return -1
 
-    def split(self, card_index):
-        new_pile = Pile(self.tableau)
-        new_pile.rect = QRect()
+    def split(self, card_index, new_pile):
+        # Move the cards from card_index onwards to new_pile. Its cards and
+        # rect are overwritten, so a single pile can be reused for every drag.
         self.get_card_rect(new_pile.rect, card_index)
-        new_pile.cards = self.cards[card_index:]
+        new_pile.cards.clear()
+        new_pile.cards.extend(itertools.islice(self.cards, card_index, None))
         new_pile.visibility = self.visibility
-        del self.cards[-len(self.cards) + card_index:]
+        del self.cards[card_index:]
         return new_pile
 
     def move(self, dx, dy):
@@ -179,12 +189,13 @@ class Pile:
     def front(self):
         return self.cards[0]
     
-def scale_rect_around_center(qrect, factor):
-    new_rect = copy.copy(qrect)
-    new_rect.setWidth(round(qrect.width() * factor))
-    new_rect.setHeight(round(qrect.height() * factor))
-    new_rect.translate(round((qrect.width() - new_rect.width()) / 2),
-                       round((qrect.height() - new_rect.height()) / 2))
+def scale_rect_around_center(qrect, factor, new_rect):
+    # Store the scaled rect in new_rect instead of returning a copy, so the
+    # caller can reuse the same QRect for every card.
+    w = round(qrect.width() * factor)
+    h = round(qrect.height() * factor)
+    new_rect.setRect(qrect.x() + round((qrect.width() - w) / 2),
+                     qrect.y() + round((qrect.height() - h) / 2), w, h)
     return new_rect
 
 ################################################################################
@@ -199,7 +210,8 @@ class Tableau(QWidget):
             self.piles.append(Pile(self, i))
         for i in range(6):
             self.piles[i].visibility = 0.0
-        self.temp_pile = None   # pile used to drag and drop
+        self.drag_pile = Pile(self)   # reused for every drag and drop
+        self.temp_pile = None   # drag_pile while dragging, None otherwise
         self.old_x = 0
         self.old_y = 0
         self.source_pile = None
@@ -209,6 +221,26 @@ class Tableau(QWidget):
         self.zoom_factor = 1.0
         self.offset_x = 0
         self.offset_y = 0
+        # Paint resources are created once and reused on every repaint.
+        # Only the stock pen depends on the zoom factor; its width is
+        # updated in recalc_layout().
+        self.hit_rect = QRect()
+        self.background_rect = QRect()
+        self.background_brush = QBrush(QColor(0,128,0))
+        self.card_brush = QBrush(QColor(255,255,255))
+        self.card_pen = QPen()
+        self.no_pen = QPen()
+        self.no_pen.setStyle(Qt.PenStyle.NoPen)
+        self.foundation_brush = QBrush(QColor(0,0,0), style=Qt.BrushStyle.Dense6Pattern)
+        self.stock_pen = QPen()
+        self.stock_pen.setColor(QColor(255,255,255,16))
+        self.back_brushes = {
+            DECK_RED:   QBrush(QColorConstants.Red, style=Qt.BrushStyle.DiagCrossPattern),
+            DECK_BLUE:  QBrush(QColorConstants.Blue, style=Qt.BrushStyle.DiagCrossPattern)
+            }
+        # Red is also used for deck values that are not in back_brushes, e.g.
+        # when QSettings returns the stored deck as a string.
+        self.default_back_brush = self.back_brushes[DECK_RED]
         self.recalc_layout()
         
     def deal(self):
@@ -266,6 +298,7 @@ class Tableau(QWidget):
         card_width = round(self.fontMetrics().height() * 8 * self.zoom_factor)
         card_height = round(card_width * CARD_RATIO)
         border_width = card_width // 5
+        self.stock_pen.setWidth(round(round(card_width * STOCK_RING_RATIO) * 0.15))
         x = border_width + self.offset_x
         y = border_width + self.offset_y
         i = 0
@@ -282,8 +315,9 @@ class Tableau(QWidget):
 
     def draw_background(self, qpainter):
         qpainter.save()
-        qpainter.setBrush(QBrush(QColor(0,128,0)))
-        qpainter.drawRect(self.rect())
+        qpainter.setBrush(self.background_brush)
+        self.background_rect.setRect(0, 0, self.width(), self.height())
+        qpainter.drawRect(self.background_rect)
         qpainter.restore()
 
     def resizeEvent(self, event):
@@ -292,10 +326,8 @@ class Tableau(QWidget):
 
     def draw_foundations(self, qpainter):
         qpainter.save()
-        pen = QPen()
-        pen.setStyle(Qt.PenStyle.NoPen)
-        qpainter.setPen(pen)
-        qpainter.setBrush(QBrush(QColor(0,0,0), style=Qt.BrushStyle.Dense6Pattern))
+        qpainter.setPen(self.no_pen)
+        qpainter.setBrush(self.foundation_brush)
         for i in range(2, 6):
             r = self.piles[i].rect
             t = round(r.width() * 0.06)
@@ -304,17 +336,14 @@ class Tableau(QWidget):
 
     def draw_stock_background(self, qpainter):
         qpainter.save()
-        pen = QPen()
-        qpainter.setPen(pen)
+        qpainter.setPen(self.card_pen)
         r = self.piles[0].rect
         t = round(r.width() * 0.06)
         qpainter.drawRoundedRect(r, t, t)
-        w = round(r.width() * 0.75)
+        w = round(r.width() * STOCK_RING_RATIO)
         x = r.x() + (r.width() - w) // 2
         y = r.y() + (r.height() - w) // 2
-        pen.setWidth(round(w * 0.15))
-        pen.setColor(QColor(255,255,255,16))
-        qpainter.setPen(pen)
+        qpainter.setPen(self.stock_pen)
         qpainter.drawEllipse(x, y, w, w)
         qpainter.restore()
 
@@ -357,7 +386,7 @@ class Tableau(QWidget):
                             pile.top().face_up = True
                             self.undo_string = ""
                         else:
-                            self.temp_pile = pile.split(card_index)
+                            self.temp_pile = pile.split(card_index, self.drag_pile)
                             self.source_pile = pile
 
     def is_valid_target_pile(self, pile):
@@ -399,7 +428,7 @@ class Tableau(QWidget):
             self.old_y = y
             # Find target pile.
             self.target_pile = None
-            rect = QRect()
+            rect = self.hit_rect
             self.temp_pile.get_card_rect(rect, 0)
             center_x = rect.x() + rect.width() // 2
             center_y = rect.y() + rect.height() // 2
@@ -430,6 +459,7 @@ class Tableau(QWidget):
                                     self.temp_pile.size())
             else:
                 self.source_pile.append(self.temp_pile)
+            self.temp_pile.clear()
             self.source_pile = None
             self.temp_pile = None
             self.target_pile = None
@@ -477,7 +507,7 @@ class Tableau(QWidget):
            pile.is_top_card(card_index):
             # we have only one card, find target pile and
             # let release event handle actual move
-            self.temp_pile = pile.split(card_index)
+            self.temp_pile = pile.split(card_index, self.drag_pile)
             self.source_pile = pile
             self.target_pile = self.get_target_foundation(self.temp_pile.front())
 
@@ -0,0 +1,150 @@
+import copy
+import os
+import random
+import sys
+
+os.environ["QT_QPA_PLATFORM"] = "offscreen"
+
+import pytest
+
+from PyQt6.QtGui import QColor, QImage, QMouseEvent, QPainter, QPixmap
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QEvent, QPointF, QRect, Qt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import PyPatience
+from PyPatience import (Card, Tableau, scale_rect_around_center,
+                        SUIT_CLUBS, SUIT_DIAMONDS, SUIT_HEARTS, SUIT_SPADES)
+
+N = 50   # number of frames and drag moves to measure
+
+################################################################################
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+@pytest.fixture
+def tableau(app):
+    random.seed(0)
+    pixmap = QPixmap(20, 30)
+    pixmap.fill(QColor(255, 255, 255))
+    tableau = Tableau()
+    tableau.resize(800, 600)
+    tableau.cards = [Card(suit, value, pixmap)
+                     for suit in (SUIT_CLUBS, SUIT_DIAMONDS, SUIT_HEARTS, SUIT_SPADES)
+                     for value in range(1, 14)]
+    tableau.deal()
+    return tableau
+
+def render(tableau, image):
+    qpainter = QPainter(image)
+    tableau.draw_background(qpainter)
+    tableau.draw_foundations(qpainter)
+    tableau.draw_stock_background(qpainter)
+    for pile in tableau.piles:
+        pile.draw_pile(qpainter)
+    if tableau.temp_pile is not None:
+        tableau.temp_pile.draw_pile(qpainter)
+    qpainter.end()
+
+def mouse_event(event_type, x, y, buttons):
+    pos = QPointF(x, y)
+    return QMouseEvent(event_type, pos, pos, Qt.MouseButton.LeftButton,
+                       buttons, Qt.KeyboardModifier.NoModifier)
+
+def top_card_center(pile):
+    r = QRect()
+    pile.get_card_rect(r, pile.size() - 1)
+    return r.x() + r.width() // 2, r.y() + r.height() // 2
+
+def drag(tableau, pile, n):
+    x, y = top_card_center(pile)
+    tableau.mousePressEvent(mouse_event(QEvent.Type.MouseButtonPress, x, y,
+                                        Qt.MouseButton.LeftButton))
+    for i in range(n):
+        # Stay below the tableau piles so there is never a valid target.
+        tableau.mouseMoveEvent(mouse_event(QEvent.Type.MouseMove, x + i % 7, 590,
+                                           Qt.MouseButton.LeftButton))
+    tableau.mouseReleaseEvent(mouse_event(QEvent.Type.MouseButtonRelease, x, 590,
+                                          Qt.MouseButton.NoButton))
+
+@pytest.fixture
+def allocations(monkeypatch):
+    # Replace the Qt value types and copy.copy() used by PyPatience.py with
+    # wrappers that count every call. The dict is cleared at the end of the
+    # warm up, so it holds the calls made during the measured frames only.
+    counts = {}
+
+    def counting(name, func):
+        def wrapper(*args, **kwargs):
+            counts[name] = counts.get(name, 0) + 1
+            return func(*args, **kwargs)
+        return wrapper
+
+    for name in ("QPen", "QBrush", "QRect", "QColor"):
+        monkeypatch.setattr(PyPatience, name, counting(name, getattr(PyPatience, name)))
+    monkeypatch.setattr(Tableau, "rect", counting("Tableau.rect", Tableau.rect))
+    monkeypatch.setattr(copy, "copy", counting("copy.copy", copy.copy))
+    return counts
+
+################################################################################
+
+def test_render_does_not_allocate(tableau, allocations):
+    image = QImage(800, 600, QImage.Format.Format_ARGB32)
+    render(tableau, image)   # warm up
+    allocations.clear()
+    for i in range(N):
+        render(tableau, image)
+    assert allocations == {}
+
+def test_drag_does_not_allocate(tableau, allocations):
+    image = QImage(800, 600, QImage.Format.Format_ARGB32)
+    pile = tableau.piles[12]
+    x, y = top_card_center(pile)
+    drag(tableau, pile, 1)   # warm up
+    allocations.clear()
+    tableau.mousePressEvent(mouse_event(QEvent.Type.MouseButtonPress, x, y,
+                                        Qt.MouseButton.LeftButton))
+    for i in range(N):
+        tableau.mouseMoveEvent(mouse_event(QEvent.Type.MouseMove, x + i % 7, 590,
+                                           Qt.MouseButton.LeftButton))
+        render(tableau, image)
+    tableau.mouseReleaseEvent(mouse_event(QEvent.Type.MouseButtonRelease, x, 590,
+                                          Qt.MouseButton.NoButton))
+    assert allocations == {}
+
+def test_split_reuses_drag_pile(tableau):
+    pile = tableau.piles[12]
+    cards = list(pile.cards)
+    drag_pile = tableau.drag_pile
+    rect = drag_pile.rect
+    pile.split(len(cards) - 3, drag_pile)
+    assert drag_pile.cards == cards[-3:]
+    assert pile.cards == cards[:-3]
+    assert drag_pile.rect is rect
+    pile.append(drag_pile)
+    drag_pile.clear()
+    assert pile.cards == cards
+    # A second split overwrites the cards left in the drag pile.
+    pile.split(len(cards) - 1, drag_pile)
+    pile.split(len(cards) - 2, drag_pile)
+    assert drag_pile.cards == cards[-2:-1]
+
+def test_drag_and_release_restores_source_pile(tableau):
+    pile = tableau.piles[12]
+    cards = list(pile.cards)
+    drag(tableau, pile, 10)
+    assert pile.cards == cards
+    assert tableau.drag_pile.cards == []
+    assert tableau.temp_pile is None
+    assert tableau.source_pile is None
+
+def test_scale_rect_around_center_writes_into_rect():
+    qrect = QRect(10, 20, 100, 200)
+    new_rect = QRect()
+    result = scale_rect_around_center(qrect, 0.5, new_rect)
+    assert result is new_rect
+    assert new_rect == QRect(35, 70, 50, 100)
+    assert qrect == QRect(10, 20, 100, 200)